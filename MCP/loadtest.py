@@ -0,0 +1,105 @@
+"""Load test for the squirrel MCP server.
+
+Measures requests/sec and latency over stdio or streamable HTTP:
+
+    python loadtest.py stdio --clients 4 --requests 500
+    python squirrel.py streamable-http   # in another terminal
+    python loadtest.py http --clients 32 --requests 500 --batch-size 100
+
+stdio spawns one server per client, since a stdio server only ever talks
+to the process that started it. Over HTTP all clients share one server.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from contextlib import asynccontextmanager
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "squirrel.py")
+
+
+@asynccontextmanager
+async def open_session(transport: str, url: str):
+    if transport == "stdio":
+        params = StdioServerParameters(command=sys.executable, args=[SERVER])
+        async with stdio_client(params) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                yield session
+    else:
+        async with streamablehttp_client(url) as (read, write, _):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                yield session
+
+
+async def run_client(client_id: int, args, latencies: list, window: list, failures: list) -> int:
+    """Run one client's share of requests and return how many names it got.
+
+    Requests the server answers with a tool error are appended to failures
+    rather than counted as names.
+    """
+    named = 0
+    async with open_session(args.transport, args.url) as session:
+        window.append(time.perf_counter())
+        for i in range(args.requests):
+            start = time.perf_counter()
+            if args.batch_size > 1:
+                characteristics = [f"Fluffy{client_id}x{i}x{j}" for j in range(args.batch_size)]
+                result = await session.call_tool("get_names", {"characteristics": characteristics})
+                names = len(characteristics)
+            else:
+                result = await session.call_tool("get_name", {"characteristic": f"Fluffy{client_id}x{i}"})
+                names = 1
+            latencies.append(time.perf_counter() - start)
+            if result.isError:
+                failures.append(result)
+            else:
+                named += names
+        window.append(time.perf_counter())
+    return named
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("transport", choices=["stdio", "http"])
+    parser.add_argument("--url", default="http://127.0.0.1:8000/mcp")
+    parser.add_argument("--clients", type=int, default=4, help="concurrent client sessions")
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="names per request; above 1 uses the get_names tool")
+    args = parser.parse_args()
+
+    # Session startup (spawning servers, MCP handshake) is excluded: the
+    # window runs from the first client ready to the last request answered.
+    latencies: list = []
+    window: list = []
+    failures: list = []
+    named = await asyncio.gather(*(run_client(i, args, latencies, window, failures) for i in range(args.clients)))
+    elapsed = max(window) - min(window)
+
+    ms = [latency * 1000 for latency in latencies]
+    print(f"transport:    {args.transport}")
+    print(f"clients:      {args.clients}")
+    print(f"requests:     {len(latencies)} ({sum(named)} names)")
+    print(f"failed:       {len(failures)}")
+    print(f"elapsed:      {elapsed:.2f}s")
+    print(f"requests/sec: {(len(latencies) - len(failures)) / elapsed:.1f} ok, {len(failures) / elapsed:.1f} failed")
+    print(f"names/sec:    {sum(named) / elapsed:.1f}")
+    print(f"latency ms:   mean {statistics.mean(ms):.2f}  p50 {percentile(ms, 50):.2f}  "
+          f"p95 {percentile(ms, 95):.2f}  p99 {percentile(ms, 99):.2f}  max {max(ms):.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
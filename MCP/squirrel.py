@@ -1,10 +1,30 @@
+import asyncio
+import os
+import sys
 from typing import Any
 import httpx
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 
 # Initialize FastMCP server
 mcp = FastMCP("squirrel")
 
+# Server-wide cap on hazard workflows running at once. Calls beyond the cap
+# wait their turn rather than failing, and every call shares the same pool
+# of LLM connections, so this is what keeps the rate limits in check.
+MAX_WORKFLOWS = int(os.environ.get("SQUIRREL_MAX_WORKFLOWS", "4"))
+workflow_slots = asyncio.Semaphore(MAX_WORKFLOWS)
+
+# analyze_hazard and validate_solution run up to 3 times each before the report.
+MAX_WORKFLOW_STEPS = 7
+
+# Upper bound on hazards per summarize_squirrel_hazards call
+MAX_SUMMARY_HAZARDS = 10
+
+
+def squirrel_name(characteristic: str) -> str:
+    return f"{characteristic}Squirrel"
+
+
 @mcp.tool()
 async def get_name(characteristic: str) -> str:
     """Get a name for a squirrel based on a characteristic.
@@ -13,11 +33,153 @@ async def get_name(characteristic: str) -> str:
        characteristic: A characteristic of the squirrel.
     """
 
-    return f"{characteristic}Squirrel"
+    return squirrel_name(characteristic)
 
-if __name__ == "__main__":
-    # Initialize and run the server
-    mcp.run(transport='stdio')
 
+@mcp.tool()
+async def get_names(characteristics: list[str]) -> list[str]:
+    """Get names for many squirrels in one call.
+
+    Args:
+       characteristics: One characteristic per squirrel. Names are returned
+          in the same order.
+    """
+
+    return [squirrel_name(characteristic) for characteristic in characteristics]
+
+
+_hazard_agent = None
+_hazard_agent_lock = asyncio.Lock()
+
+
+def _load_hazard_agent():
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "langchain"))
+    import final_agent
+
+    return final_agent, final_agent.create_workflow()
+
+
+async def hazard_agent():
+    """Import final_agent once, compiling its graph once per server process.
+
+    The import is deferred so get_name works without OPENAI_API_KEY, and it
+    runs in a worker thread so loading langchain and langgraph doesn't stall
+    other clients. After the first workflow call the compiled graph and the
+    module-level ChatOpenAI client stay warm for every later call.
+    """
+    global _hazard_agent
+    async with _hazard_agent_lock:
+        if _hazard_agent is None:
+            _hazard_agent = await asyncio.to_thread(_load_hazard_agent)
+    return _hazard_agent
+
+
+async def run_hazard_workflow(ctx: Context, on_step) -> dict[str, Any]:
+    """Run one hazard workflow, awaiting on_step(node, state) after each node."""
+    if workflow_slots.locked():
+        await ctx.info(f"waiting for one of {MAX_WORKFLOWS} workflow slots")
+    async with workflow_slots:
+        _, workflow = await hazard_agent()
+        state = {
+            "hazard": "",
+            "solution": "",
+            "is_valid": False,
+            "validation_feedback": "",
+            "report": "",
+            "attempts": 0
+        }
+        async for update in workflow.astream(state, stream_mode="updates"):
+            for node, node_state in update.items():
+                state.update(node_state)
+                await on_step(node, state)
+        return state
+
+
+@mcp.tool()
+async def analyze_squirrel_hazard(ctx: Context) -> dict[str, Any]:
+    """Generate a hazard for an acorn-stealing squirrel, then find and validate a low-tech solution.
+
+    Sends a progress notification as each step of the workflow finishes.
+    """
+
+    step = 0
+
+    async def on_step(node: str, state: dict[str, Any]) -> None:
+        nonlocal step
+        step += 1
+        await ctx.report_progress(step, MAX_WORKFLOW_STEPS)
+        await ctx.info(f"{node} finished (attempt {state['attempts']})")
+
+    result = await run_hazard_workflow(ctx, on_step)
+    await ctx.report_progress(MAX_WORKFLOW_STEPS, MAX_WORKFLOW_STEPS)
+    return {
+        "hazard": result["hazard"],
+        "solution": result["solution"],
+        "is_valid": result["is_valid"],
+        "validation_feedback": result["validation_feedback"],
+        "attempts": result["attempts"],
+        "report": result["report"]
+    }
 
 
+@mcp.tool()
+async def summarize_squirrel_hazards(ctx: Context, count: int = 5) -> str:
+    """Analyze several hazards and return a comprehensive mitigation report.
+
+    Args:
+       count: How many hazards to analyze, from 1 to 10.
+    """
+
+    if not 1 <= count <= MAX_SUMMARY_HAZARDS:
+        raise ValueError(f"count must be between 1 and {MAX_SUMMARY_HAZARDS}, got {count}")
+
+    # Progress is shared across the concurrent workflows so it only ever
+    # increases; the final summary counts as the last step.
+    total = count * MAX_WORKFLOW_STEPS + 1
+    step = 0
+
+    def on_step_for(i: int):
+        async def on_step(node: str, state: dict[str, Any]) -> None:
+            nonlocal step
+            step += 1
+            await ctx.report_progress(step, total)
+            await ctx.info(f"hazard {i + 1}: {node} finished (attempt {state['attempts']})")
+        return on_step
+
+    # If one workflow fails, or the client cancels the call, stop the others
+    # so they release their slots instead of running on for nothing.
+    runs = [asyncio.create_task(run_hazard_workflow(ctx, on_step_for(i))) for i in range(count)]
+    try:
+        results = await asyncio.gather(*runs)
+    except BaseException:
+        for run in runs:
+            run.cancel()
+        await asyncio.gather(*runs, return_exceptions=True)
+        raise
+    hazard_analyses = [
+        {
+            "hazard": result["hazard"],
+            "solution": result["solution"],
+            "is_valid": result["is_valid"],
+            "validation_feedback": result["validation_feedback"],
+            "attempts": result["attempts"]
+        }
+        for result in results
+    ]
+    # The summary is one more LLM call, so it takes a workflow slot as well.
+    if workflow_slots.locked():
+        await ctx.info(f"waiting for one of {MAX_WORKFLOWS} workflow slots")
+    async with workflow_slots:
+        await ctx.info("writing the final summary")
+        final_agent, _ = await hazard_agent()
+        summary = await asyncio.to_thread(final_agent.generate_final_summary, hazard_analyses)
+    await ctx.report_progress(total, total)
+    return summary
+
+
+if __name__ == "__main__":
+    # Initialize and run the server. stdio serves a single client; pass
+    # "streamable-http" to serve many concurrent clients over HTTP
+    # (FASTMCP_HOST and FASTMCP_PORT pick the address, default 127.0.0.1:8000).
+    transport = sys.argv[1] if len(sys.argv) > 1 else "stdio"
+    mcp.run(transport=transport)
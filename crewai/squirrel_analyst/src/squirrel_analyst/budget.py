@@ -0,0 +1,38 @@
+"""Pre-kickoff token budget check for the crew's task text.
+
+Uses the repo's shared tokenbudget.py; outside a checkout (see
+checkout.py) the check is skipped.
+"""
+from typing import Any, Dict, List, Optional
+
+import squirrel_analyst.checkout  # noqa: F401
+
+try:
+    import tokenbudget
+except ImportError:
+    tokenbudget = None
+
+# Token budget for each task's description and expected output. crewAI adds
+# the agent's role, backstory and tool schemas around them, so this checks a
+# lower bound on the prompt, before anything is sent.
+TASK_DESCRIPTION_BUDGET = 600
+
+
+def _interpolate(text: str, inputs: Dict[str, Any]) -> str:
+    for key, value in inputs.items():
+        text = text.replace("{" + key + "}", str(value))
+    return text
+
+
+def check_task_budgets(tasks: List[Any], inputs: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """before_kickoff hook: raise PromptBudgetError if any task's text is over budget."""
+    if tokenbudget is None:
+        return inputs
+    for i, task in enumerate(tasks, start=1):
+        description = getattr(task, "_original_description", None) or task.description
+        expected_output = getattr(task, "_original_expected_output", None) or task.expected_output
+        text = _interpolate(description + "\n" + expected_output, inputs or {})
+        llm = getattr(task.agent, "llm", None)
+        model = getattr(llm, "model", None) or tokenbudget.DEFAULT_MODEL
+        tokenbudget.check_budget(text, TASK_DESCRIPTION_BUDGET, model, f"task {task.name or i} description")
+    return inputs
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from crewai import Task
+from crewai.tasks.output_format import OutputFormat
+from crewai.tasks.task_output import TaskOutput
+
+# Task outputs are stored under this directory, one JSON file per cache key.
+CACHE_DIR = Path(os.environ.get("SQUIRREL_ANALYST_CACHE_DIR", ".task_cache"))
+
+
+# Off unless an entry point opts in with enable_cache(): train(), test() and
+# replay() exist to re-execute tasks, so they must never see cached outputs.
+_enabled = False
+
+
+def enable_cache() -> None:
+    global _enabled
+    _enabled = True
+
+
+def cache_enabled() -> bool:
+    """Whether the entry point opted in; SQUIRREL_ANALYST_CACHE=0 turns it off regardless."""
+    return _enabled and os.environ.get("SQUIRREL_ANALYST_CACHE", "1") != "0"
+
+
+def _agent_fingerprint(agent: Any) -> Dict[str, Any]:
+    llm = getattr(agent, "llm", None)
+    return {
+        "role": agent.role,
+        "goal": agent.goal,
+        "backstory": agent.backstory,
+        "llm": getattr(llm, "model", None) or str(llm),
+        "temperature": getattr(llm, "temperature", None),
+        "tools": sorted(tool.name for tool in agent.tools or []),
+    }
+
+
+def task_cache_key(task: Task, agent: Any, context: Optional[str], tools: Optional[List[Any]]) -> str:
+    """Content address for one task execution.
+
+    The description and expected output are hashed after kickoff has
+    interpolated them, so they already carry the crew inputs. The upstream
+    task outputs arrive as the context string.
+    """
+    payload = {
+        "task": {
+            "description": task.description,
+            "expected_output": task.expected_output,
+            "output_json": getattr(task.output_json, "__name__", None),
+            "output_pydantic": getattr(task.output_pydantic, "__name__", None),
+        },
+        "agent": _agent_fingerprint(agent),
+        "tools": sorted(tool.name for tool in tools or []),
+        "context": context or "",
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _read_entry(path: Path) -> Optional[str]:
+    """Return a cached raw output, or None on a miss or an unreadable entry."""
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))["raw"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return raw if isinstance(raw, str) else None
+
+
+def _write_entry(path: Path, raw: str) -> None:
+    # Write to a temp file and rename it into place, so an interrupted run
+    # never leaves a truncated entry behind.
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"raw": raw}, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class CachedTask(Task):
+    """Task that serves its output from the on-disk cache when nothing changed.
+
+    Only the raw output is cached, so tasks using output_json or
+    output_pydantic re-execute as usual. So do tasks with human input or a
+    guardrail, since a cache hit skips the agent executor entirely.
+    """
+
+    def _execute_core(self, agent, context, tools) -> TaskOutput:
+        agent = agent or self.agent
+        if (
+            not cache_enabled()
+            or agent is None
+            or self.output_json
+            or self.output_pydantic
+            or self.human_input
+            or self.guardrail
+        ):
+            return super()._execute_core(agent, context, tools)
+
+        path = CACHE_DIR / f"{task_cache_key(self, agent, context, tools)}.json"
+        raw = _read_entry(path)
+        if raw is None:
+            output = super()._execute_core(agent, context, tools)
+            _write_entry(path, output.raw)
+            return output
+
+        output = TaskOutput(
+            name=self.name,
+            description=self.description,
+            expected_output=self.expected_output,
+            raw=raw,
+            agent=agent.role,
+            output_format=OutputFormat.RAW,
+        )
+        self.output = output
+        if self.output_file:
+            self._save_file(raw)
+        if self.callback:
+            self.callback(output)
+        return output
@@ -0,0 +1,13 @@
+"""Puts the agent-crash-course checkout on sys.path, when running from one.
+
+eventlog.py and tokenbudget.py live at the root of the checkout, shared
+with the standalone examples. Run from a checkout (the editable install
+`crewai install` sets up), importing this module makes them importable;
+installed anywhere else, nothing is added and they are simply not found.
+"""
+import sys
+from pathlib import Path
+
+_parents = Path(__file__).resolve().parents
+if len(_parents) > 4 and (_parents[4] / "eventlog.py").is_file() and str(_parents[4]) not in sys.path:
+    sys.path.append(str(_parents[4]))
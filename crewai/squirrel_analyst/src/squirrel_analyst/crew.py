@@ -1,11 +1,41 @@
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import CrewBase, agent, before_kickoff, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List
+from typing import Dict, List, Optional
+
+from squirrel_analyst import events
+from squirrel_analyst.budget import check_task_budgets
+from squirrel_analyst.cache import CachedTask
+
 # If you want to run a snippet of code before or after the crew starts,
 # you can use the @before_kickoff and @after_kickoff decorators
 # https://docs.crewai.com/concepts/crews#example-crew-class-with-decorators
 
+# Angles the fan-out crew splits {topic} into. Each angle gets its own
+# researcher task and its own report section, all of which run concurrently.
+RESEARCH_ANGLES = [
+    "recent breakthroughs",
+    "real-world adoption",
+    "tooling and ecosystem",
+    "risks and open problems",
+    "outlook for the coming year",
+]
+
+
+def _with_angle(config: Dict, angle: str) -> Dict:
+    """Return a copy of a task config with {angle} filled in.
+
+    {angle} is not a crew input, so it has to be substituted before
+    kickoff interpolates the remaining placeholders.
+    """
+    config = dict(config)
+    # Each angle's task gets its own agent, passed to the Task explicitly.
+    config.pop("agent", None)
+    for key in ("description", "expected_output"):
+        config[key] = config[key].replace("{angle}", angle)
+    return config
+
+
 @CrewBase
 class SquirrelAnalyst():
     """SquirrelAnalyst crew"""
@@ -23,14 +53,14 @@ class SquirrelAnalyst():
     def researcher(self) -> Agent:
         return Agent(
             config=self.agents_config['researcher'], # type: ignore[index]
-            verbose=True
+            verbose=events.verbose
         )
 
     @agent
     def reporting_analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['reporting_analyst'], # type: ignore[index]
-            verbose=True
+            verbose=events.verbose
         )
 
     # To learn more about structured task outputs,
@@ -38,17 +68,21 @@ class SquirrelAnalyst():
     # https://docs.crewai.com/concepts/tasks#overview-of-a-task
     @task
     def research_task(self) -> Task:
-        return Task(
+        return CachedTask(
             config=self.tasks_config['research_task'], # type: ignore[index]
         )
 
     @task
     def reporting_task(self) -> Task:
-        return Task(
+        return CachedTask(
             config=self.tasks_config['reporting_task'], # type: ignore[index]
             output_file='report.md'
         )
 
+    @before_kickoff
+    def check_budgets(self, inputs):
+        return check_task_budgets(self.tasks, inputs)
+
     @crew
     def crew(self) -> Crew:
         """Creates the SquirrelAnalyst crew"""
@@ -59,6 +93,85 @@ class SquirrelAnalyst():
             agents=self.agents, # Automatically created by the @agent decorator
             tasks=self.tasks, # Automatically created by the @task decorator
             process=Process.sequential,
-            verbose=True,
+            verbose=events.verbose,
+            step_callback=events.step_callback,
+            task_callback=events.task_callback,
             # process=Process.hierarchical, # In case you wanna use that instead https://docs.crewai.com/how-to/Hierarchical/
         )
+
+    def _fresh_agent(self, name: str) -> Agent:
+        # Async tasks run on their own threads, and crewAI keeps the executor
+        # and its message history on the Agent, so each concurrent task needs
+        # an Agent of its own.
+        return Agent(
+            config=self.agents_config[name], # type: ignore[index]
+            verbose=events.verbose
+        )
+
+    def fanout_crew(self, angles: Optional[List[str]] = None) -> Crew:
+        """Creates the fan-out variant of the SquirrelAnalyst crew
+
+        Research is split into one async task per angle, and the report
+        sections are written by one async task per angle as well. The
+        synchronous outline and merge tasks are the only join points, so
+        latency is bounded by the slowest section rather than the sum.
+        """
+        angles = angles or RESEARCH_ANGLES
+
+        researchers = [self._fresh_agent('researcher') for _ in angles]
+        writers = [self._fresh_agent('reporting_analyst') for _ in angles]
+
+        research = [
+            CachedTask(
+                config=_with_angle(self.tasks_config['research_subtask'], angle), # type: ignore[index]
+                agent=researcher,
+                async_execution=True,
+            )
+            for angle, researcher in zip(angles, researchers)
+        ]
+
+        # crewAI won't let an async task read the output of an async task in
+        # the same run of async tasks, so the outline doubles as the barrier
+        # between the research and section fan-outs.
+        outline = CachedTask(
+            config=self.tasks_config['outline_task'], # type: ignore[index]
+            context=research,
+        )
+
+        sections = [
+            CachedTask(
+                config=_with_angle(self.tasks_config['section_task'], angle), # type: ignore[index]
+                agent=writer,
+                context=[findings, outline],
+                async_execution=True,
+            )
+            for angle, writer, findings in zip(angles, writers, research)
+        ]
+
+        def write_report(output) -> None:
+            # All section futures have been joined by the time the merge task
+            # runs, so their outputs can be stitched together in order.
+            parts = [output.raw] + [section.output.raw for section in sections]
+            with open('report.md', 'w', encoding='utf-8') as f:
+                f.write("\n\n".join(part.strip() for part in parts) + "\n")
+            # crewAI only installs the crew's task_callback on tasks without a
+            # callback of their own, so pass the merge task's output on here.
+            if events.task_callback is not None:
+                events.task_callback(output)
+
+        merge = CachedTask(
+            config=self.tasks_config['merge_task'], # type: ignore[index]
+            context=sections,
+            callback=write_report,
+        )
+
+        tasks = [*research, outline, *sections, merge]
+        return Crew(
+            agents=[self.reporting_analyst(), *researchers, *writers],
+            tasks=tasks,
+            before_kickoff_callbacks=[lambda inputs: check_task_budgets(tasks, inputs)],
+            process=Process.sequential,
+            verbose=events.verbose,
+            step_callback=events.step_callback,
+            task_callback=events.task_callback,
+        )
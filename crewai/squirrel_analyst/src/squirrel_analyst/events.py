@@ -0,0 +1,15 @@
+"""Hooks the crew into the repo's shared event log, when there is one.
+
+Outside a checkout (see checkout.py) the crew keeps its usual verbose
+printing.
+"""
+import squirrel_analyst.checkout  # noqa: F401
+
+try:
+    from eventlog import events
+except ImportError:
+    events = None
+
+verbose = events.verbose if events is not None else True
+step_callback = events.crew_step if events is not None else None
+task_callback = events.crew_task if events is not None else None
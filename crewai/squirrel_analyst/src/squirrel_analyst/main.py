@@ -4,6 +4,7 @@ import warnings
 
 from datetime import datetime
 
+from squirrel_analyst.cache import enable_cache
 from squirrel_analyst.crew import SquirrelAnalyst
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
@@ -22,12 +23,29 @@ def run():
         'current_year': str(datetime.now().year)
     }
     
+    enable_cache()
     try:
         SquirrelAnalyst().crew().kickoff(inputs=inputs)
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
 
 
+def run_fanout():
+    """
+    Run the fan-out crew, researching and writing sections in parallel.
+    """
+    inputs = {
+        'topic': 'AI LLMs',
+        'current_year': str(datetime.now().year)
+    }
+
+    enable_cache()
+    try:
+        SquirrelAnalyst().fanout_crew().kickoff(inputs=inputs)
+    except Exception as e:
+        raise Exception(f"An error occurred while running the fan-out crew: {e}")
+
+
 def train():
     """
     Train the crew for a given number of iterations.
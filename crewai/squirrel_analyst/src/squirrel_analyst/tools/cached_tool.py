@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from abc import abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from crewai.tools import BaseTool
+from pydantic import PrivateAttr, model_validator
+
+
+class CachedAsyncTool(BaseTool):
+    """Base class for tools with a native async entry point, memoization and timing.
+
+    Subclasses implement `_execute` (and override `_aexecute` when they have
+    real async I/O) instead of `_run`, and must set `args_schema`. Both `_run`
+    and `_arun` validate the input against it, so the cache key is the
+    validated input and equivalent calls share an entry.
+
+    crewAI's agents call tools synchronously through `_run`; `_arun` is for
+    calling a tool from asyncio code, e.g. fanning calls out with
+    `asyncio.gather` without blocking the event loop.
+
+    Memoization is off unless `cache_size` is above zero. Entries expire
+    after `cache_ttl` seconds (never when None), and the least recently used
+    entry is evicted once the cache is full.
+    """
+
+    cache_size: int = 0
+    cache_ttl: Optional[float] = None
+
+    _cache: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _stats: Dict[str, float] = PrivateAttr(
+        default_factory=lambda: {"calls": 0, "hits": 0, "misses": 0, "errors": 0, "seconds": 0.0}
+    )
+
+    @model_validator(mode="after")
+    def _require_args_schema(self) -> "CachedAsyncTool":
+        # Without an explicit schema crewAI derives one from the signature of
+        # _run(**kwargs), which is a single "kwargs" field.
+        if "kwargs" in self.args_schema.model_fields:
+            raise ValueError(f"{type(self).__name__} must set args_schema")
+        return self
+
+    @abstractmethod
+    def _execute(self, **kwargs: Any) -> Any:
+        """Compute the tool's result from the validated arguments."""
+
+    async def _aexecute(self, **kwargs: Any) -> Any:
+        # Run blocking implementations off the event loop by default.
+        return await asyncio.to_thread(self._execute, **kwargs)
+
+    def _run(self, **kwargs: Any) -> Any:
+        key, arguments = self._prepare(kwargs)
+        hit, result = self._lookup(key)
+        if hit:
+            return result
+        start = time.perf_counter()
+        try:
+            result = self._execute(**arguments)
+        except Exception:
+            self._finish(key, None, start, failed=True)
+            raise
+        self._finish(key, result, start)
+        return result
+
+    async def _arun(self, **kwargs: Any) -> Any:
+        key, arguments = self._prepare(kwargs)
+        hit, result = self._lookup(key)
+        if hit:
+            return result
+        start = time.perf_counter()
+        try:
+            result = await self._aexecute(**arguments)
+        except Exception:
+            self._finish(key, None, start, failed=True)
+            raise
+        self._finish(key, result, start)
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        """Calls, cache hits and misses, errors and total seconds spent executing."""
+        with self._lock:
+            return {**self._stats, "cached": len(self._cache)}
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _prepare(self, kwargs: Dict[str, Any]) -> tuple:
+        validated = self.args_schema(**kwargs)
+        return validated.model_dump_json(), validated.model_dump()
+
+    def _lookup(self, key: str) -> tuple:
+        with self._lock:
+            self._stats["calls"] += 1
+            entry = self._cache.get(key) if self.cache_size > 0 else None
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self._cache.move_to_end(key)
+                self._stats["hits"] += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._cache[key]
+            self._stats["misses"] += 1
+            return False, None
+
+    def _finish(self, key: str, result: Any, start: float, failed: bool = False) -> None:
+        with self._lock:
+            self._stats["seconds"] += time.perf_counter() - start
+            if failed:
+                self._stats["errors"] += 1
+                return
+            if self.cache_size > 0:
+                expires = time.monotonic() + self.cache_ttl if self.cache_ttl is not None else None
+                self._cache[key] = (expires, result)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
@@ -1,19 +1,28 @@
-from crewai.tools import BaseTool
 from typing import Type
 from pydantic import BaseModel, Field
 
+from squirrel_analyst.tools.cached_tool import CachedAsyncTool
+
 
 class MyCustomToolInput(BaseModel):
     """Input schema for MyCustomTool."""
     argument: str = Field(..., description="Description of the argument.")
 
-class MyCustomTool(BaseTool):
+class MyCustomTool(CachedAsyncTool):
     name: str = "Name of my tool"
     description: str = (
         "Clear description for what this tool is useful for, your agent will need this information to use it."
     )
     args_schema: Type[BaseModel] = MyCustomToolInput
+    # Results are not cached by default. For a tool without side effects
+    # whose output only depends on its input, remember up to 128 results
+    # for 10 minutes with:
+    #     cache_size: int = 128
+    #     cache_ttl: float = 600
 
-    def _run(self, argument: str) -> str:
+    def _execute(self, argument: str) -> str:
         # Implementation goes here
         return "this is an example of a tool output, ignore it and move along."
+
+    # Override _aexecute as well when the tool does I/O with an async client;
+    # by default _arun runs _execute in a worker thread.
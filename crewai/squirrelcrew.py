@@ -1,8 +1,14 @@
 import os
+import sys
 from crewai import Agent, Task, Crew, Process
 from crewai.tools import tool
 from langchain_openai import ChatOpenAI
 
+# eventlog lives at the repo root, shared with the other examples
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from eventlog import events
+from tokenbudget import TokenUsage, check_budget
+
 @tool
 def acrobatic_distraction_display(hazard_description: str) -> str:
     """
@@ -55,6 +61,10 @@ def decoy_drop(hazard_description: str) -> str:
 # LLM with low temperature for deterministic plans
 llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.2, max_tokens=300)
 
+# Token budget for each task's description and expected output, checked
+# before kickoff so an oversized task fails without a network round-trip
+TASK_DESCRIPTION_BUDGET = 600
+
 # Define the squirrel strategist agent
 squirrel_strategist = Agent(
     role="Wise Squirrel Strategist",
@@ -64,7 +74,7 @@ squirrel_strategist = Agent(
         "You train young squirrels to navigate dangerous environments without using human tools. "
         "Your advice must always be practical, action-oriented, and believable for a squirrel."
     ),
-    verbose=True,
+    verbose=events.verbose,
     tools=[
         acrobatic_distraction_display,
         camouflage_and_wait,
@@ -102,10 +112,22 @@ squirrel_task = Task(
 crew = Crew(
     agents=[squirrel_strategist],
     tasks=[squirrel_task],
-    process=Process.sequential
+    process=Process.sequential,
+    step_callback=events.crew_step,
+    task_callback=events.crew_task
 )
 
 # Run the plan
 if __name__ == "__main__":
+    # crewAI adds the agent's role, backstory and tool schemas around each
+    # task, so these counts cover only the task text: a lower bound on the prompt.
+    usage = TokenUsage(model=llm.model_name)
+    for i, task in enumerate(crew.tasks, start=1):
+        task_text = task.description + "\n" + task.expected_output
+        check_budget(task_text, TASK_DESCRIPTION_BUDGET, usage.model, f"task {i} description")
+        usage.record(f"task {i} text (estimate)", task_text, budget=TASK_DESCRIPTION_BUDGET)
+    events.emit("crew_started", crew="squirrelcrew", hazard=hazard)
     result = crew.kickoff()
+    events.emit("crew_finished", crew="squirrelcrew", result=result.raw)
     print(f"\n Final Tool-Based Strategy for Hazard: '{hazard}'\n")
+    print(usage.report())
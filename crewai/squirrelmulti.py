@@ -1,15 +1,25 @@
 import os
+import sys
 from dotenv import load_dotenv
 from crewai import Agent, Task, Crew, Process
 from crewai.tools import tool
 from langchain_openai import ChatOpenAI
 
+# eventlog lives at the repo root, shared with the other examples
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from eventlog import events
+from tokenbudget import TokenUsage, check_budget
+
 # Load environment variables (OPENAI_API_KEY)
 load_dotenv()
 
 # Set up LLM
 llm = ChatOpenAI(model="gpt-4", temperature=0.7)
 
+# Token budget for each task's description and expected output, checked
+# before kickoff so an oversized task fails without a network round-trip
+TASK_DESCRIPTION_BUDGET = 600
+
 # Custom Tools
 
 @tool
@@ -52,7 +62,7 @@ commander_chip = Agent(
         "planning and ability to synthesize complex information into actionable strategies. "
         "He trusts his custom intel sources but always cross-references with current conditions."
     ),
-    verbose=True,
+    verbose=events.verbose,
     allow_delegation=False,
     tools=[badger_garden_intel_briefing_tool, web_search_tool],
     llm=llm
@@ -65,7 +75,7 @@ pip_squeak = Agent(
         "Pip 'Solutions' Squeak is the SSS gadget guru, though his 'gadgets' are purely natural. "
         "He can MacGyver a solution for anything using twigs, leaves, and cleverness."
     ),
-    verbose=True,
+    verbose=events.verbose,
     allow_delegation=False,
     llm=llm
 )
@@ -77,7 +87,7 @@ slink_stripe = Agent(
         "Slink 'Executioner' Stripe is the field ops master of the SSS. "
         "He turns high-level strategy into minute-by-minute plans and always prepares for the unexpected."
     ),
-    verbose=True,
+    verbose=events.verbose,
     allow_delegation=False,
     llm=llm
 )
@@ -130,7 +140,9 @@ sss_crew = Crew(
     agents=[commander_chip, pip_squeak, slink_stripe],
     tasks=[task1, task2, task3],
     process=Process.sequential,
-    verbose=True
+    verbose=events.verbose,
+    step_callback=events.crew_step,
+    task_callback=events.crew_task
 )
 
 # Kickoff
@@ -138,10 +150,21 @@ if __name__ == "__main__":
     print("Operation: Acorn Hoard - Initiating SSS Crew... ")
     print("----------------------------------------------------")
     try:
+        # crewAI adds the agent's role, backstory and tool schemas around each
+        # task, so these counts cover only the task text: a lower bound on the prompt.
+        usage = TokenUsage(model=llm.model_name)
+        for i, task in enumerate(sss_crew.tasks, start=1):
+            task_text = task.description + "\n" + task.expected_output
+            check_budget(task_text, TASK_DESCRIPTION_BUDGET, usage.model, f"task {i} description")
+            usage.record(f"task {i} text (estimate)", task_text, budget=TASK_DESCRIPTION_BUDGET)
+        events.emit("crew_started", crew="sss_crew")
         result = sss_crew.kickoff()
+        events.emit("crew_finished", crew="sss_crew", result=result.raw)
         print("\n----------------------------------------------------")
         print("Operation: Acorn Hoard - Mission Report ")
         print("----------------------------------------------------")
         print(result)
+        print(usage.report())
     except Exception as e:
+        events.emit("crew_failed", level="error", crew="sss_crew", error=str(e))
         print(f"\nMission Aborted! Error: {e}")
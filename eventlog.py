@@ -0,0 +1,154 @@
+"""Buffered, structured event log shared by the crews and graphs in this repo.
+
+Agents and nodes call ``events.emit(...)``, which only puts a dict on a
+queue; a background thread serializes the queued events and appends them
+to a JSONL file in batches, so a slow terminal or disk never stalls an
+LLM call and concurrent runs never interleave half-written lines.
+
+Configured from the environment:
+
+    SQUIRREL_EVENT_LOG     path of the JSONL file; unset disables the log
+                           and leaves the usual verbose printing on
+    SQUIRREL_EVENT_LEVEL   lowest level written (debug, info, warning, error)
+    SQUIRREL_EVENT_SAMPLE  fraction of events kept per level, e.g.
+                           "debug=0.1,info=1"; unlisted levels keep all events
+"""
+import atexit
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+# Long LLM outputs are cut to this many characters in step events.
+MAX_TEXT = 2000
+
+
+def _parse_sample(spec: str) -> Dict[str, float]:
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        level, _, rate = item.partition("=")
+        try:
+            rates[level.strip().lower()] = float(rate)
+        except ValueError:
+            print(f"eventlog: ignoring bad sample rate {item!r}", file=sys.stderr)
+    return rates
+
+
+class EventLog:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        level: str = "info",
+        sample: Optional[Dict[str, float]] = None,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        max_queue: int = 10000,
+    ):
+        self.path = path
+        if level not in LEVELS:
+            print(f"eventlog: unknown level {level!r}, using 'info'", file=sys.stderr)
+            level = "info"
+        self.level = LEVELS[level]
+        self.sample = sample or {}
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_queue)
+        self._writer: Optional[threading.Thread] = None
+        if path:
+            self._writer = threading.Thread(target=self._drain, name="eventlog-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
+    @classmethod
+    def from_env(cls) -> "EventLog":
+        return cls(
+            path=os.environ.get("SQUIRREL_EVENT_LOG") or None,
+            level=os.environ.get("SQUIRREL_EVENT_LEVEL", "info").strip().lower(),
+            sample=_parse_sample(os.environ.get("SQUIRREL_EVENT_SAMPLE", "")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._writer is not None
+
+    @property
+    def verbose(self) -> bool:
+        """Whether agents should print to stdout; off once events go to the log."""
+        return not self.enabled
+
+    def emit(self, event: str, level: str = "info", **fields: Any) -> None:
+        """Queue an event without blocking; events are dropped if the queue is full."""
+        if not self.enabled or LEVELS.get(level, LEVELS["info"]) < self.level:
+            return
+        rate = self.sample.get(level, 1.0)
+        if rate < 1.0 and random.random() >= rate:
+            return
+        record = {"ts": time.time(), "level": level, "event": event, "pid": os.getpid(), **fields}
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def say(self, event: str, message: str, level: str = "info", **fields: Any) -> None:
+        """Emit an event, and print the message as well when running verbose."""
+        self.emit(event, level=level, message=message, **fields)
+        if self.verbose:
+            print(message)
+
+    def crew_step(self, step: Any) -> None:
+        """crewAI step_callback: one debug event per agent thought or tool call."""
+        text = getattr(step, "text", None) or getattr(step, "output", None) or str(step)
+        self.emit(
+            "agent_step",
+            level="debug",
+            step_type=type(step).__name__,
+            tool=getattr(step, "tool", None),
+            text=str(text)[:MAX_TEXT],
+        )
+
+    def crew_task(self, output: Any) -> None:
+        """crewAI task_callback: one event per finished task."""
+        self.emit(
+            "task_completed",
+            task=output.name or output.description[:80],
+            agent=output.agent,
+            output_chars=len(output.raw or ""),
+        )
+
+    def close(self) -> None:
+        """Flush everything queued so far and stop the writer thread."""
+        if self._writer is None:
+            return
+        writer, self._writer = self._writer, None
+        self._queue.put(None)
+        writer.join()
+        if self.dropped:
+            print(f"eventlog: dropped {self.dropped} events, queue was full", file=sys.stderr)
+
+    def _drain(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            done = False
+            while not done:
+                batch = []
+                try:
+                    batch.append(self._queue.get(timeout=self.flush_interval))
+                    while len(batch) < self.batch_size:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    pass
+                if None in batch:
+                    done = True
+                    batch = [record for record in batch if record is not None]
+                if batch:
+                    f.write("".join(json.dumps(record, default=str) + "\n" for record in batch))
+                    f.flush()
+
+
+events = EventLog.from_env()
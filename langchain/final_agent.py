@@ -3,9 +3,16 @@ from langgraph.graph import Graph, StateGraph, END
 from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
 from langchain_core.tools import tool
+import logging
 import os
+import sys
 from dotenv import load_dotenv
 
+# eventlog and tokenbudget live at the repo root, shared with the other examples
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from eventlog import events
+from tokenbudget import PromptBudgetError, TokenUsage, fit_prompt
+
 
 # Load environment variables
 load_dotenv()
@@ -14,6 +21,37 @@ load_dotenv()
 # Initialize the language model
 llm = ChatOpenAI(model="gpt-3.5-turbo")
 
+# Prompt token budget for each node. Feedback is trimmed first; the hazard
+# and solution are only cut when the prompt can't fit any other way.
+PROMPT_BUDGETS = {
+    "analyze_hazard": 600,
+    "validate_solution": 900,
+    "generate_report": 900,
+    "generate_final_summary": 500,
+}
+
+# The final summary grows with the number of analyses, so its budget does too.
+SUMMARY_TOKENS_PER_HAZARD = 600
+
+# Token counts for every prompt sent in this process
+usage = TokenUsage(model=llm.model_name)
+
+
+def fit_node_prompt(node: str, build: Callable[..., str], trimmable: List[str],
+                    last_resort: List[str], budget: int) -> str:
+    """Fit a node's prompt to its budget.
+
+    A prompt that can't fit even fully trimmed is sent as built, with a
+    warning event, rather than stopping the graph in the middle of a run.
+    """
+    try:
+        return fit_prompt(build, trimmable, budget, usage.model, last_resort)
+    except PromptBudgetError as e:
+        # Never print here: inside the stdio MCP server, stdout is the protocol stream.
+        events.emit("prompt_over_budget", level="warning", node=node, error=str(e))
+        logging.getLogger(__name__).warning("%s: %s; sending the prompt untrimmed", node, e)
+        return build(*trimmable, *last_resort)
+
 
 # Define the state type
 class AgentState(TypedDict):
@@ -66,7 +104,8 @@ def analyze_hazard(state: AgentState) -> AgentState:
     previous_feedback = state.get("validation_feedback", "")
     
     # Create a prompt for the LLM
-    prompt = f"""Given the following hazard for a squirrel trying to steal an acorn:
+    def build(previous_feedback: str, hazard: str) -> str:
+        return f"""Given the following hazard for a squirrel trying to steal an acorn:
     {hazard}
     
     {f'Previous attempt feedback: {previous_feedback}' if attempts > 0 else ''}
@@ -76,13 +115,18 @@ def analyze_hazard(state: AgentState) -> AgentState:
     Keep the response concise and practical.
     
     {'IMPORTANT: This is a revision attempt. Please address the previous feedback.' if attempts > 0 else ''}"""
+
+    budget = PROMPT_BUDGETS["analyze_hazard"]
+    prompt = fit_node_prompt("analyze_hazard", build, [previous_feedback], [hazard], budget)
     
     # Get response from LLM
     response = llm.invoke([HumanMessage(content=prompt)])
+    usage.record("analyze_hazard", prompt, response.content, budget)
     
     # Update state with solution
     state["solution"] = response.content
     state["attempts"] = attempts + 1
+    events.emit("node_finished", node="analyze_hazard", attempt=state["attempts"], hazard=hazard)
     return state
 
 
@@ -92,7 +136,8 @@ def validate_solution(state: AgentState) -> AgentState:
     solution = state["solution"]
     
     # Create a prompt for the LLM
-    prompt = f"""Review this solution for a squirrel facing the following hazard:
+    def build(hazard: str, solution: str) -> str:
+        return f"""Review this solution for a squirrel facing the following hazard:
     Hazard: {hazard}
     Proposed Solution: {solution}
     
@@ -112,9 +157,14 @@ def validate_solution(state: AgentState) -> AgentState:
     - Doesn't require human intervention or technology
     
     Be generous in your validation - if the solution is mostly good but needs minor adjustments, consider it valid."""
+
+    budget = PROMPT_BUDGETS["validate_solution"]
+    # The solution is what's being judged, so it is cut only as a last resort.
+    prompt = fit_node_prompt("validate_solution", build, [hazard], [solution], budget)
     
     # Get response from LLM
     response = llm.invoke([HumanMessage(content=prompt)])
+    usage.record("validate_solution", prompt, response.content, budget)
     response_text = response.content.strip()
     
     # Parse the response more robustly
@@ -137,6 +187,7 @@ def validate_solution(state: AgentState) -> AgentState:
     # Update state
     state["is_valid"] = is_valid
     state["validation_feedback"] = feedback
+    events.emit("node_finished", node="validate_solution", attempt=state["attempts"], is_valid=is_valid)
     return state
 
 
@@ -159,7 +210,8 @@ def generate_report(state: AgentState) -> AgentState:
     attempts = state["attempts"]
     
     # Create a prompt for the LLM
-    prompt = f"""Create a structured report for a squirrel's hazard mitigation plan:
+    def build(feedback: str, hazard: str, solution: str) -> str:
+        return f"""Create a structured report for a squirrel's hazard mitigation plan:
 
     HAZARD: {hazard}
     PROPOSED SOLUTION: {solution}
@@ -174,12 +226,17 @@ def generate_report(state: AgentState) -> AgentState:
     4. Is written in a friendly, encouraging tone
     
     Keep it brief but informative."""
+
+    budget = PROMPT_BUDGETS["generate_report"]
+    prompt = fit_node_prompt("generate_report", build, [feedback], [hazard, solution], budget)
     
     # Get response from LLM
     response = llm.invoke([HumanMessage(content=prompt)])
+    usage.record("generate_report", prompt, response.content, budget)
     
     # Update state with report
     state["report"] = response.content
+    events.emit("node_finished", node="generate_report", attempt=attempts, is_valid=is_valid)
     return state
 
 
@@ -216,17 +273,21 @@ def create_workflow() -> Graph:
 def generate_final_summary(hazard_analyses: List[Dict[str, Any]]) -> str:
     """Generate a comprehensive summary of all hazards and solutions."""
     # Create a prompt for the LLM
-    prompt = f"""Create a comprehensive summary report for a squirrel's hazard mitigation strategies.
+    count = len(hazard_analyses)
+
+    def build(*parts: str) -> str:
+        feedbacks, solutions, hazards = parts[:count], parts[count:2 * count], parts[2 * count:]
+        return f"""Create a comprehensive summary report for a squirrel's hazard mitigation strategies.
     The report should cover all the following hazard analyses:
 
     {chr(10).join([f'''
     HAZARD {i+1}:
-    - Hazard: {analysis['hazard']}
-    - Solution: {analysis['solution']}
+    - Hazard: {hazard}
+    - Solution: {solution}
     - Validation: {'✓ Valid' if analysis['is_valid'] else '✗ Invalid'}
-    - Feedback: {analysis['validation_feedback']}
+    - Feedback: {feedback}
     - Attempts: {analysis['attempts']}
-    ''' for i, analysis in enumerate(hazard_analyses)])}
+    ''' for i, (analysis, feedback, solution, hazard) in enumerate(zip(hazard_analyses, feedbacks, solutions, hazards))])}
 
     Format the report to include:
     1. An executive summary of all hazards and solutions
@@ -237,9 +298,16 @@ def generate_final_summary(hazard_analyses: List[Dict[str, Any]]) -> str:
     
     Use clear headings, bullet points, and a friendly, encouraging tone.
     Make it comprehensive but easy to understand."""
+
+    budget = PROMPT_BUDGETS["generate_final_summary"] + SUMMARY_TOKENS_PER_HAZARD * count
+    feedbacks = [analysis['validation_feedback'] for analysis in hazard_analyses]
+    solutions = [analysis['solution'] for analysis in hazard_analyses]
+    hazards = [analysis['hazard'] for analysis in hazard_analyses]
+    prompt = fit_node_prompt("generate_final_summary", build, feedbacks, solutions + hazards, budget)
     
     # Get response from LLM
     response = llm.invoke([HumanMessage(content=prompt)])
+    usage.record("generate_final_summary", prompt, response.content, budget)
     return response.content
 
 
@@ -280,6 +348,7 @@ def main():
     print("="*80)
     print(generate_final_summary(hazard_analyses))
     print("="*80)
+    print(usage.report())
 
 
 if __name__ == "__main__":
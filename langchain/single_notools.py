@@ -1,6 +1,17 @@
+import os
+import sys
 from typing import TypedDict, Annotated, List
 from langgraph.graph.message import add_messages
 
+# eventlog lives at the repo root, shared with the other examples
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from eventlog import events
+from tokenbudget import PromptBudgetError, TokenUsage, fit_prompt
+
+# Prompt token budget for the strategist; long hazard descriptions are trimmed to fit
+PROMPT_BUDGET = 500
+usage = TokenUsage(model="gpt-4o-mini")
+
 class SquirrelAgentStateNoTools(TypedDict):
     messages: Annotated[List, add_messages]
     llm_generated_solution: str
@@ -27,7 +38,7 @@ except Exception as e:
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
 def squirrel_strategist_node_no_tools(state: SquirrelAgentStateNoTools):
-    print("\n--- Squirrel Strategist Node (No Tools) Called ---")
+    events.say("node_started", "\n--- Squirrel Strategist Node (No Tools) Called ---", node="squirrel_strategist_no_tools")
     current_messages = state['messages']
     hazard_description = ""
 
@@ -37,14 +48,15 @@ def squirrel_strategist_node_no_tools(state: SquirrelAgentStateNoTools):
     hazard_description = current_messages[-1].content
 
     if llm_no_tools is None:
-        print("LLM (no tools) not available. Using fallback response.")
+        events.say("llm_unavailable", "LLM (no tools) not available. Using fallback response.", level="warning")
         solution = "My brain's a bit fuzzy for direct advice now (LLM not configured for 'no tools')."
         return {
             "messages": current_messages + [AIMessage(content=solution)],
             "llm_generated_solution": solution
         }
 
-    print(f"Asking the wise squirrel spirit (LLM - no tools) about: {hazard_description}")
+    events.say("llm_request", f"Asking the wise squirrel spirit (LLM - no tools) about: {hazard_description}",
+               hazard=hazard_description)
 
     # Craft a detailed prompt to guide the LLM
     system_prompt_template = """You are a wise old squirrel, an expert in survival and outsmarting hazards when trying to secure acorns.
@@ -61,13 +73,22 @@ Think step-by-step for your plan. For example:
 4. Mention a quick getaway.
 """
     
-    prompt_messages = [
-        SystemMessage(content=system_prompt_template),
-        HumanMessage(content=f"The hazard is: '{hazard_description}'. What's your low-tech advice?")
-    ]
+    def build(hazard_description: str):
+        return [
+            SystemMessage(content=system_prompt_template),
+            HumanMessage(content=f"The hazard is: '{hazard_description}'. What's your low-tech advice?")
+        ]
+
+    # The hazard is the whole question, so it is only cut when nothing else fits
+    try:
+        prompt_messages = fit_prompt(build, [], PROMPT_BUDGET, usage.model, last_resort=[hazard_description])
+    except PromptBudgetError as e:
+        events.say("prompt_over_budget", f"{e}; sending the prompt untrimmed", level="warning")
+        prompt_messages = build(hazard_description)
 
     ai_response = llm_no_tools.invoke(prompt_messages)
-    print(f"LLM (No Tools) Response: {ai_response.content}")
+    usage.record("squirrel_strategist_no_tools", prompt_messages, ai_response.content, PROMPT_BUDGET)
+    events.say("llm_response", f"LLM (No Tools) Response: {ai_response.content}", level="debug")
 
     solution = ai_response.content
     
@@ -99,6 +120,7 @@ if llm_no_tools: # Only run if LLM was initialized
     print(final_state_no_tools['llm_generated_solution'])
     if final_state_no_tools.get('messages'):
         print(f"\nFinal AI Message (No Tools): {final_state_no_tools['messages'][-1].content}")
+    events.say("token_usage", usage.report(), usage=usage.summary())
 
 else:
     print("\nLLM for 'No Tools' scenario not initialized. Skipping 'No Tools' agent run.")
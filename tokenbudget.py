@@ -0,0 +1,162 @@
+"""Local token accounting and prompt budgets, shared by the examples in this repo.
+
+Prompt sizes are counted offline before a request is sent, so an
+oversized prompt is trimmed (or rejected) up front instead of failing or
+crawling after the network round-trip. Counting uses tiktoken when it is
+installed (``pip install tiktoken``); otherwise it falls back to a rough
+four-characters-per-token estimate. Encoders are loaded once per model and
+cached; point TIKTOKEN_CACHE_DIR at a local directory to keep the BPE
+files off the network after the first run.
+"""
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+DEFAULT_MODEL = "gpt-3.5-turbo"
+
+# Chat formatting overhead from OpenAI's token counting guide: every
+# message costs a few tokens on top of its content, and every reply is
+# primed with a few more.
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+TRIM_MARKER = " [...]"
+
+
+class PromptBudgetError(ValueError):
+    """Raised when a prompt exceeds its budget even with everything trimmable removed."""
+
+
+@lru_cache(maxsize=None)
+def encoder(model: str = DEFAULT_MODEL):
+    """Return the cached tiktoken encoder for a model, or None without tiktoken."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    enc = encoder(model)
+    if enc is None:
+        return (len(text) + 3) // 4
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: Sequence[Any], model: str = DEFAULT_MODEL) -> int:
+    """Count a chat prompt: LangChain messages or {"role", "content"} dicts."""
+    total = TOKENS_PER_REPLY
+    for message in messages:
+        content = message["content"] if isinstance(message, dict) else message.content
+        total += TOKENS_PER_MESSAGE + count_tokens(str(content), model)
+    return total
+
+
+def count_prompt_tokens(prompt: Union[str, Sequence[Any]], model: str = DEFAULT_MODEL) -> int:
+    if isinstance(prompt, str):
+        return count_message_tokens([{"content": prompt}], model)
+    return count_message_tokens(prompt, model)
+
+
+def trim_to_tokens(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> str:
+    """Cut text down to max_tokens, keeping the start and marking the cut."""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    keep = max(0, max_tokens - count_tokens(TRIM_MARKER, model))
+    enc = encoder(model)
+    if enc is None:
+        return text[:keep * 4] + TRIM_MARKER
+    return enc.decode(enc.encode(text, disallowed_special=())[:keep]) + TRIM_MARKER
+
+
+def fit_prompt(
+    build: Callable[..., Union[str, List[Any]]],
+    trimmable: Sequence[str],
+    budget: int,
+    model: str = DEFAULT_MODEL,
+    last_resort: Sequence[str] = (),
+):
+    """Build a prompt that fits the budget by trimming the trimmable parts.
+
+    build is called with one argument per trimmable string, followed by
+    one per last_resort string. If the full prompt is over budget, the
+    tokens left after the rest of the prompt are shared evenly between the
+    trimmable parts. The last_resort parts (the text the LLM is actually
+    asked about) are only cut when the prompt cannot fit even with every
+    trimmable part removed.
+    """
+    trimmable, last_resort = list(trimmable), list(last_resort)
+    prompt = build(*trimmable, *last_resort)
+    if count_prompt_tokens(prompt, model) <= budget:
+        return prompt
+
+    empty = [""] * len(trimmable)
+    fixed = count_prompt_tokens(build(*empty, *last_resort), model)
+    if trimmable and fixed <= budget:
+        share = (budget - fixed) // len(trimmable)
+        return build(*(trim_to_tokens(part, share, model) for part in trimmable), *last_resort)
+
+    fixed = count_prompt_tokens(build(*empty, *[""] * len(last_resort)), model)
+    if fixed > budget or not last_resort:
+        raise PromptBudgetError(f"prompt needs {fixed} tokens even with all trimmable text removed, budget is {budget}")
+    share = (budget - fixed) // len(last_resort)
+    return build(*empty, *(trim_to_tokens(part, share, model) for part in last_resort))
+
+
+def check_budget(text: str, budget: int, model: str = DEFAULT_MODEL, what: str = "prompt") -> int:
+    """Raise PromptBudgetError if text is over budget; returns its token count."""
+    tokens = count_tokens(text, model)
+    if tokens > budget:
+        raise PromptBudgetError(f"{what} needs {tokens} tokens, budget is {budget}")
+    return tokens
+
+
+class TokenUsage:
+    """Per-node token counts for one run, safe to share between threads."""
+
+    def __init__(self, model: str = DEFAULT_MODEL):
+        self.model = model
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, Dict[str, int]] = {}
+
+    def record(self, node: str, prompt: Union[str, Sequence[Any]], completion: str = "",
+               budget: Optional[int] = None) -> int:
+        """Count a prompt (and its completion, once known) against a node; returns the prompt tokens."""
+        prompt_tokens = count_prompt_tokens(prompt, self.model)
+        completion_tokens = count_tokens(completion, self.model) if completion else 0
+        with self._lock:
+            stats = self._nodes.setdefault(
+                node, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "max_prompt": 0, "budget": 0}
+            )
+            stats["calls"] += 1
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+            stats["max_prompt"] = max(stats["max_prompt"], prompt_tokens)
+            stats["budget"] = budget or stats["budget"]
+        return prompt_tokens
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {node: dict(stats) for node, stats in self._nodes.items()}
+
+    def report(self) -> str:
+        rows = [f"{'node':<32}{'calls':>6}{'prompt':>9}{'completion':>12}{'max prompt':>12}{'budget':>8}"]
+        totals = [0, 0, 0]
+        for node, stats in self.summary().items():
+            rows.append(
+                f"{node:<32}{stats['calls']:>6}{stats['prompt_tokens']:>9}{stats['completion_tokens']:>12}"
+                f"{stats['max_prompt']:>12}{stats['budget'] or '-':>8}"
+            )
+            totals[0] += stats["calls"]
+            totals[1] += stats["prompt_tokens"]
+            totals[2] += stats["completion_tokens"]
+        rows.append(f"{'total':<32}{totals[0]:>6}{totals[1]:>9}{totals[2]:>12}")
+        counter = "tiktoken" if tiktoken is not None else "estimated, tiktoken not installed"
+        return f"Token usage ({self.model}, {counter}):\n" + "\n".join(rows)